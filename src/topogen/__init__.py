@@ -1,14 +1,42 @@
 """topogen topology generator"""
 
+import importlib
 import importlib.metadata as importlib_metadata
+from typing import TYPE_CHECKING, Any
 
-from .config import Config
-from .render import Renderer
 from .main import main
 
-_metadata = importlib_metadata.metadata("topogen")
-__version__ = _metadata["Version"]
-__description__ = _metadata["Summary"]
+if TYPE_CHECKING:
+    from .config import Config
+    from .render import Renderer
+
+# public names and the submodule they live in, imported on first access
+_LAZY_ATTRS = {
+    "Config": ".config",
+    "Renderer": ".render",
+}
+
+_METADATA_ATTRS = {
+    "__version__": "Version",
+    "__description__": "Summary",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+    elif name in _METADATA_ATTRS:
+        value = importlib_metadata.metadata("topogen")[_METADATA_ATTRS[name]]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # cache it, __getattr__ is only called for missing names
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRS, *_METADATA_ATTRS])
 
 
 __all__ = ["Config", "Renderer", "main"]
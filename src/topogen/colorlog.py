@@ -30,7 +30,14 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + template + reset,
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.formatters = {
+            level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()
+        }
+        # for levels without a format, e.g. custom levels
+        self.default_formatter = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.formatters.get(record.levelno, self.default_formatter)
         return formatter.format(record)
@@ -1,17 +1,25 @@
 """configuration for topogen"""
 
+import json
 import logging
-from dataclasses import dataclass
+import os
+import tomllib
+from dataclasses import dataclass, fields, replace
 from ipaddress import IPv4Network
-
-from serde import deserialize, serialize, SerdeError
-from serde.toml import from_toml, to_toml
+from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
+# parsed configurations, keyed by (absolute path, mtime in ns, size)
+_CACHE: dict[tuple[str, int, int], "Config"] = {}
+
+
+def _toml_string(value: str) -> str:
+    """quote the given value as a TOML basic string. JSON escaping is a
+    subset of TOML escaping, except for DEL which JSON leaves alone"""
+    return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
 
-@deserialize
-@serialize
 @dataclass
 class Config:
     """topology generator configuration"""
@@ -23,21 +31,56 @@ class Config:
     username: str = "cisco"
     password: str = "cisco"
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Config":
+        """create a configuration from the given dict, missing keys use the
+        defaults, unknown keys are ignored"""
+        kwargs: dict[str, Any] = {}
+        for field in fields(cls):
+            if field.name not in data:
+                continue
+            value = data[field.name]
+            if not isinstance(value, str):
+                raise TypeError(f"{field.name}: expected a string, got {value!r}")
+            if field.type is IPv4Network:
+                value = IPv4Network(value)
+            kwargs[field.name] = value
+        return cls(**kwargs)
+
     @classmethod
     def load(cls, filename: str) -> "Config":
-        """load the configuration from the given file"""
+        """load the configuration from the given file. Files which did not
+        change since they were last loaded are not parsed again. A copy is
+        returned as the renderer modifies the configuration."""
         try:
-            with open(filename, encoding="utf-8") as handle:
-                cfg = from_toml(cls, handle.read())
+            stat = os.stat(filename)
+            key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+            cached = _CACHE.get(key)
+            if cached is None:
+                with open(filename, "rb") as handle:
+                    cached = cls.from_dict(tomllib.load(handle))
+                _CACHE[key] = cached
+            cfg = replace(cached)
             _LOGGER.info("Configuration loaded from file %s", filename)
-        except (FileNotFoundError, TypeError, SerdeError) as exc:
+        except (FileNotFoundError, TypeError, ValueError) as exc:
+            # ValueError includes TOML decode and IP address errors
             if not isinstance(exc, FileNotFoundError):
                 _LOGGER.error(exc)
             cfg = cls()
             _LOGGER.warning("using configuration defaults")
         return cfg
 
+    def to_toml(self) -> str:
+        """return the configuration as a TOML document"""
+        return "".join(
+            f"{field.name} = {_toml_string(str(getattr(self, field.name)))}\n"
+            for field in fields(self)
+        )
+
     def save(self, filename: str):
         """save the configuration to the given file"""
+        path = os.path.abspath(filename)
+        for key in [key for key in _CACHE if key[0] == path]:
+            del _CACHE[key]
         with open(filename, "w+", encoding="utf-8") as handle:
-            handle.write(to_toml(self))
+            handle.write(self.to_toml())
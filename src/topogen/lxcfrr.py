@@ -2,32 +2,29 @@
 
 from textwrap import dedent
 
-from jinja2 import BaseLoader, Environment
-
+from topogen import templates
 from topogen.config import Config
 from topogen.models import TopogenNode
 
+_BASIC_CONFIG = dedent(
+    r"""
+    #/bin/bash
+    {%- if dhcp %}
+    /sbin/udhcpc -i eth0
+    {%- endif %}
+    sed -r -e 's/^#(MAX_FDS=1024)$/\1/'{{ sed_exprs }} -i /etc/frr/daemons
+    echo "nameserver {{ nameserver }}" >/etc/resolv.conf
+    echo "search {{ config.domainname }}" >>/etc/resolv.conf
+    """
+).lstrip("\n")
+
 
 def lxcfrr_bootconfig(
     cfg: Config, node: TopogenNode, protocols: list[str], nameserver: str, dhcp: bool
 ) -> str:
     """renders the DNS host template"""
-    basic_config = dedent(
-        r"""
-        #/bin/bash
-        {%- if dhcp %}
-        /sbin/udhcpc -i eth0
-        {%- endif %}
-        sed -r -e 's/^#(MAX_FDS=1024)$/\1/' -i /etc/frr/daemons
-        {%- for proto in protocols %}
-        sed -r -e 's/^({{ proto }}d=)no$/\1yes/' -i /etc/frr/daemons
-        {%- endfor %}
-        echo "nameserver {{ nameserver }}" >/etc/resolv.conf
-        echo "search {{ config.domainname }}" >>/etc/resolv.conf
-        """
-    ).lstrip("\n")
-
-    template = Environment(loader=BaseLoader).from_string(basic_config)  # type: ignore
-    return template.render(
-        node=node, config=cfg, protocols=protocols, nameserver=nameserver, dhcp=dhcp
+    # enable all protocol daemons with a single sed invocation
+    sed_exprs = "".join(f" -e 's/^({proto}d=)no$/\\1yes/'" for proto in protocols)
+    return templates.string_template("lxcfrr", _BASIC_CONFIG).render(
+        node=node, config=cfg, sed_exprs=sed_exprs, nameserver=nameserver, dhcp=dhcp
     )
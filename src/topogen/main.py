@@ -4,13 +4,13 @@ argument parsing and logging
 """
 
 import argparse
+import functools
 import logging
 import os
 import sys
 
 import topogen
 from topogen.models import TopogenError
-from topogen.render import Renderer, get_templates
 from topogen.colorlog import CustomFormatter
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,8 +25,9 @@ def valid_node_count(value):
     return ivalue
 
 
+@functools.lru_cache(maxsize=1)
 def create_argparser():
-    """create the argparser for topogen"""
+    """create the argparser for topogen, it is built once and then reused"""
     parser = argparse.ArgumentParser(
         prog=topogen.__name__, description=topogen.__description__
     )
@@ -120,21 +121,22 @@ def create_argparser():
     return parser
 
 
+LOG_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARN": logging.WARNING,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+
 def get_log_level(level_name: str) -> tuple[int, bool]:
-    log_levels = {
-        "CRITICAL": logging.CRITICAL,
-        "ERROR": logging.ERROR,
-        "WARN": logging.WARNING,
-        "WARNING": logging.WARNING,
-        "INFO": logging.INFO,
-        "DEBUG": logging.DEBUG,
-        "NOTSET": logging.NOTSET,
-    }
-    level_name = level_name.upper()
-    if level_name in log_levels:
-        return log_levels[level_name], False
-    else:
+    level = LOG_LEVELS.get(level_name.upper())
+    if level is None:
         return logging.WARNING, True
+    return level, False
 
 
 def setup_logging(loglevel: str):
@@ -165,6 +167,12 @@ def main():
     if args.insecure:
         args.cafile = None
 
+    # the renderer pulls in NetworkX and the client library, only import it
+    # when it is needed. Parsing the arguments, --help and --version and
+    # writing the config don't need it
+    # pylint: disable=import-outside-toplevel
+    from topogen.render import Renderer, get_templates
+
     if args.listtemplates:
         print("Available templates: ", ", ".join(get_templates()))
         return 0
@@ -1,14 +1,17 @@
 """models for topogen topology generator"""
 
-from dataclasses import dataclass, replace
-from ipaddress import IPv4Address, IPv4Interface
+import math
+import socket
+from dataclasses import dataclass, field
+from ipaddress import IPV4LENGTH
+from itertools import count, islice
 
 
 class TopogenError(Exception):
     """Base class for all errors raised by topogen"""
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     """a point in a carthesian coordinate system"""
 
@@ -16,55 +19,105 @@ class Point:
     y: int
 
 
+def _spiral_point(index: int, distance: int = 200) -> tuple[int, int]:
+    """return the coordinates of the point at the given index of the square
+    spiral. The spiral goes up 1, right 1, down 2, left 2, up 3, right 3 and
+    so on, after m such run pairs (m * (m + 1) steps) it is at (s, s) with
+    s = -m / 2 for even m and s = (m + 1) / 2 for odd m."""
+    pairs = (math.isqrt(4 * index + 1) - 1) // 2
+    offset = index - pairs * (pairs + 1)
+    length = pairs + 1
+    # even pairs go up, then right, odd pairs go down, then left
+    sign = -1 if pairs & 1 else 1
+    start = length // 2 if pairs & 1 else -(pairs // 2)
+    if offset <= length:
+        x, y = start, start + sign * offset
+    else:
+        x, y = start + sign * (offset - length), start + sign * length
+    return x * distance, y * distance
+
+
 class CoordsGenerator:
     """a generator which generates square spiral coordinates"""
 
-    DIRSM = {"l": "u", "u": "r", "r": "d", "d": "l"}
+    # unit steps for the directions up, right, down and left, in turning order
+    DIRX = (0, 1, 0, -1)
+    DIRY = (1, 0, -1, 0)
 
     def __init__(self, distance: int = 200):
         self.distance = distance
-        self.step = 1
-        self.dir = "u"
-        self.point = Point(0, 0)
 
     def __iter__(self):
-        while True:
-            for _ in (0, 1):
-                for _ in range(self.step):
-                    yield replace(self.point)
-                    if self.dir == "u":
-                        self.point.y += self.distance
-                    elif self.dir == "r":
-                        self.point.x += self.distance
-                    elif self.dir == "d":
-                        self.point.y -= self.distance
-                    else:  # self.dir == "l"
-                        self.point.x -= self.distance
-                self.dir = CoordsGenerator.DIRSM[self.dir]
-            self.step += 1
-
-
-@dataclass
+        for index in count():
+            yield Point(*_spiral_point(index, self.distance))
+
+    @classmethod
+    def take(cls, num: int, distance: int = 200) -> list[Point]:
+        """return the first num coordinates of the spiral. This uses NumPy
+        if it is installed (it is an optional dependency)"""
+        try:
+            import numpy as np
+        except ImportError:
+            return list(islice(cls(distance), num))
+
+        if num <= 0:
+            return []
+        # run k of the spiral has k // 2 + 1 steps into direction k % 4, 2m
+        # runs have m * (m + 1) steps which covers the num - 1 steps needed
+        runs = np.arange(2 * (math.isqrt(num) + 1))
+        dirs = np.repeat(runs & 3, runs // 2 + 1)[: num - 1]
+        xs = np.concatenate(([0], np.cumsum(np.take(cls.DIRX, dirs)) * distance))
+        ys = np.concatenate(([0], np.cumsum(np.take(cls.DIRY, dirs)) * distance))
+        return [Point(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+
+
+@dataclass(slots=True, frozen=True)
+class IPv4Iface:
+    """an IPv4 interface address kept as integers. It provides the parts of
+    the ipaddress.IPv4Interface API which the templates use, without deriving
+    the network and netmask objects on construction. The address and the
+    netmask are only needed as strings, these are formatted once."""
+
+    addr: int
+    prefixlen: int
+    ip: str = field(init=False, compare=False)
+    netmask: str = field(init=False, compare=False)
+
+    def __post_init__(self):
+        mask = ((1 << self.prefixlen) - 1) << IPV4LENGTH - self.prefixlen
+        object.__setattr__(self, "ip", socket.inet_ntoa(self.addr.to_bytes(4)))
+        object.__setattr__(self, "netmask", socket.inet_ntoa(mask.to_bytes(4)))
+
+    @property
+    def with_prefixlen(self) -> str:
+        """the address in a.b.c.d/len notation"""
+        return f"{self.ip}/{self.prefixlen}"
+
+    def __str__(self) -> str:
+        return self.with_prefixlen
+
+
+@dataclass(slots=True)
 class TopogenInterface:
     """interface of a node, slot is the physical slot in the device"""
 
-    address: IPv4Interface
+    address: IPv4Iface
     description: str = ""
     slot: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TopogenNode:
     """a node of a topology"""
 
     hostname: str
-    loopback: IPv4Interface | None
+    loopback: IPv4Iface | None
     interfaces: list[TopogenInterface]
 
 
-@dataclass
+@dataclass(slots=True)
 class DNShost:
     """a DNS host of a topology, this typically only exists once"""
 
     name: str
-    ipv4: IPv4Address
+    ipv4: str
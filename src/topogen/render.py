@@ -1,16 +1,23 @@
 """topology renderer"""
 
+import functools
 import importlib.resources as pkg_resources
+import itertools
 import logging
 import math
 import os
+import re
 from argparse import Namespace
+from bisect import insort
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from ipaddress import IPV4LENGTH, IPv4Interface, IPv4Network
-from typing import Any, Set, Tuple, Union
+from operator import attrgetter, itemgetter
+from typing import Any, Tuple, Union
 
 import enlighten
 import networkx as nx
+from networkx.utils import UnionFind
 
 from httpx import ConnectTimeout, HTTPError
 from jinja2 import (
@@ -30,6 +37,7 @@ from topogen.lxcfrr import lxcfrr_bootconfig
 from topogen.models import (
     CoordsGenerator,
     DNShost,
+    IPv4Iface,
     Point,
     TopogenError,
     TopogenInterface,
@@ -41,6 +49,36 @@ _LOGGER = logging.getLogger(__name__)
 EXT_CON_NAME = "ext-conn-0"
 DNS_HOST_NAME = "dns-host"
 
+# sort key for the interfaces of a node
+BY_SLOT = attrgetter("slot")
+
+# point-to-point networks are /30s with two hosts
+P2P_PREFIXLEN = 30
+
+# number of concurrent API requests when creating many elements
+API_WORKERS = 16
+
+# Kamada-Kawai needs all pairs shortest paths, O(N^2) memory and worse
+# compute, larger networks use the Fruchterman-Reingold spring layout. The
+# spring layout still is O(N^2) per iteration, very large networks are
+# placed randomly.
+KK_LAYOUT_MAX_NODES = 50
+SPRING_LAYOUT_MAX_NODES = 500
+
+# characters not suitable for DNS names
+DNS_TRANSLATION = str.maketrans({"/": "_", " ": "-"})
+
+# long interface names and their abbreviations for DNS names, the regex
+# alternatives must be sorted by length so that the longest name wins
+INTERFACE_NAMES = {
+    "TenGigabitEthernet": "ten",
+    "GigabitEthernet": "gi",
+    "Ethernet": "e",
+}
+INTERFACE_NAMES_RE = re.compile(
+    "|".join(sorted(INTERFACE_NAMES, key=len, reverse=True))
+)
+
 
 def get_templates() -> list[str]:
     """get all available templates in the package"""
@@ -51,53 +89,59 @@ def get_templates() -> list[str]:
     ]
 
 
+@functools.lru_cache(maxsize=1)
+def get_environment() -> Environment:
+    """return the Jinja environment for the package templates, shared by all
+    renderers. Compiled templates are also kept in a bytecode cache so that
+    they survive across runs, if the cache can't be created they are compiled
+    on every run. The package templates do not change while running, loaded
+    templates are reused without checking their source."""
+    return Environment(
+        loader=PackageLoader("topogen"),
+        autoescape=select_autoescape(),
+        auto_reload=False,
+        bytecode_cache=templates.bytecode_cache(),
+    )
+
+
+@functools.cache
 def disable_pcl_loggers():
-    """set all virl python client library loggers to WARN, too much output"""
-    loggers = [
-        logging.getLogger(name)
-        for name in logging.root.manager.loggerDict  # pylint disable=E1101
-    ]
-    for logger in loggers:
-        if logger.name.startswith("virl2_client"):
-            logger.setLevel(logging.WARN)
+    """set all virl python client library loggers to WARN, too much output.
+    This only needs to happen once, all PCL modules are imported by now."""
+    # only loggers with a matching name are looked up, this also turns the
+    # placeholder of the "virl2_client" parent into a logger
+    for name in logging.root.manager.loggerDict:  # pylint: disable=no-member
+        if name.startswith("virl2_client"):
+            logging.getLogger(name).setLevel(logging.WARN)
 
 
-def order_iface_pair(iface_pair: dict, this: int) -> Tuple[Any, Any]:
+def order_iface_pair(iface_pair: tuple, this: int) -> Tuple[Any, Any]:
     """order the interface pair so that the first one is the one with the
-    given index "this", and the second one is the other one.
+    given index "this", and the second one is the other one. The pair is a
+    (src index, src interface, dst index, dst interface) tuple, this also
+    works with other data per end instead of the interfaces.
     """
-    (src_idx, src_iface), (_, dst_iface) = iface_pair.items()
+    src_idx, src_iface, _, dst_iface = iface_pair
     if this == src_idx:
         return src_iface, dst_iface
     return dst_iface, src_iface
 
 
-def format_dns_entry(iface_pair: dict, this: int) -> str:
-    """format the interface pair labels suitable for a DNS entry"""
-    table = {
-        ord("/"): "_",
-        ord(" "): "-",
-    }
-
-    # these must be sorted by key length
-    interface_names = {
-        "TenGigabitEthernet": "ten",
-        "GigabitEthernet": "gi",
-        "Ethernet": "e",
-    }
-
-    src, dst = order_iface_pair(iface_pair, this)
-    desc = f"{src.node.label}-{src.label}--{dst.node.label}-{dst.label}"
+def format_dns_name(desc: str) -> str:
+    """format a "node-label interface-label" string suitable for a DNS entry"""
+    desc = INTERFACE_NAMES_RE.sub(lambda m: INTERFACE_NAMES[m.group(0)], desc)
+    return desc.translate(DNS_TRANSLATION).lower()
 
-    for long, short in interface_names.items():
-        if long in desc:
-            desc = desc.replace(long, short)
-            break
 
-    return desc.translate(table).lower()
+def format_dns_entry(iface_pair: tuple, this: int) -> str:
+    """format the interface pair labels suitable for a DNS entry"""
+    src, dst = order_iface_pair(iface_pair, this)
+    src_name = format_dns_name(f"{src.node.label} {src.label}")
+    dst_name = format_dns_name(f"{dst.node.label} {dst.label}")
+    return f"{src_name}--{dst_name}"
 
 
-def format_interface_description(iface_pair: dict, this: int) -> str:
+def format_interface_description(iface_pair: tuple, this: int) -> str:
     """this puts the interface description together which gets inserted
     into the router configuration."""
 
@@ -124,34 +168,52 @@ class Renderer:
             raise TopogenError("need to provide number of nodes!")
 
         self.template = self.load_template()
+        # the configuration is the same for all nodes, bind it once. Changes
+        # to its attributes, like the name server, are still picked up
+        self.render_template = functools.partial(self.template.render, config=cfg)
         self.client = self.initialize_client()
 
         self.lab = self.client.create_lab(args.labname)
+        # the lab is not started, checking for convergence after every
+        # element which is created is an unnecessary API call
+        self.lab.wait_for_convergence = False
         _LOGGER.info("lab: %s", self.lab.id)
 
+        # unconnected interfaces by node ID, handed out by new_interface()
+        self.free_interfaces: dict[str, deque[Interface]] = {}
+
+        # the address pools are plain integers, address objects are only
+        # created for the addresses which are actually used
+
         # these will be /32 addresses
-        self.loopbacks = IPv4Network(cfg.loopbacks).subnets(
-            prefixlen_diff=IPV4LENGTH - cfg.loopbacks.prefixlen
+        self.loopbacks = iter(
+            range(
+                int(cfg.loopbacks.network_address),
+                int(cfg.loopbacks.broadcast_address) + 1,
+            )
         )
         # we do not want to use .0
         next(self.loopbacks)
 
-        # these will be /30 addresses (4 addresses, 1 network, 1 broadcast, 2
-        # hosts) e.g. 2 bits (hence the -2)
-        self.p2pnets = IPv4Network(cfg.p2pnets).subnets(
-            prefixlen_diff=IPV4LENGTH - cfg.p2pnets.prefixlen - 2
+        # these are the network addresses of /30 networks (4 addresses, 1
+        # network, 1 broadcast, 2 hosts)
+        self.p2pnets = iter(
+            range(
+                int(cfg.p2pnets.network_address),
+                int(cfg.p2pnets.broadcast_address) + 1,
+                1 << (32 - P2P_PREFIXLEN),
+            )
         )
 
-        self.coords = iter(CoordsGenerator(distance=args.distance))
+        # the node sequence places the DNS host and the routers on the
+        # spiral, with progress enabled the first point is skipped
+        self.coords = iter(CoordsGenerator.take(args.nodes + 2, distance=args.distance))
 
     def load_template(self) -> Template:
         """load the template"""
         name = self.args.template
-        env = Environment(
-            loader=PackageLoader("topogen"), autoescape=select_autoescape()
-        )
         try:
-            return env.get_template(f"{name}{Renderer.J2SUFFIX}")
+            return get_environment().get_template(f"{name}{Renderer.J2SUFFIX}")
         except TemplateNotFound as exc:
             raise TopogenError(f"template does not exist: {name}") from exc
 
@@ -169,6 +231,11 @@ class Renderer:
             client = ClientLibrary(ssl_verify=cainfo)
             if not client.is_system_ready():
                 raise TopogenError("system is not ready")
+            # the PCL's httpx client already keeps connections alive. But
+            # with auto sync, reading node and interface properties fetches
+            # the whole topology again once per second. We are the only
+            # writer of the new lab and sync explicitly where needed.
+            client.auto_sync = False
             return client
         except ConnectTimeout as exc:
             raise TopogenError("no connection: " + str(exc)) from None
@@ -177,16 +244,38 @@ class Renderer:
                 "no env provided, need VIRL2_URL, VIRL2_USER and VIRL2_PASS"
             ) from exc
 
-    @staticmethod
-    def new_interface(cmlnode: Node) -> Interface:
-        """create a new CML interface for the given node"""
-        iface = cmlnode.next_available_interface()
-        if iface is None:
-            iface = cmlnode.create_interface()
-        return iface
+    def collect_free_interfaces(self):
+        """collect the unconnected physical interfaces of all nodes in a
+        single pass, Node.interfaces() goes through all interfaces of the lab
+        on every call. Needs to be called after the lab is synced."""
+        self.free_interfaces.clear()
+        for iface in self.lab.interfaces():
+            if iface.physical and not iface.connected:
+                self.free_interfaces.setdefault(iface.node.id, deque()).append(iface)
+
+    def new_interface(self, cmlnode: Node) -> Interface:
+        """return the next available CML interface of the given node or
+        create a new one. Interfaces are handed out once, even when their link
+        has not been created yet."""
+        free = self.free_interfaces.get(cmlnode.id)
+        if free:
+            return free.popleft()
+        return cmlnode.create_interface()
+
+    def interfaces_by_slot(self) -> dict[tuple[str, int], Interface]:
+        """return all interfaces of the lab keyed by node ID and slot. This is
+        a single pass, Node.get_interface_by_slot() goes through all
+        interfaces of the lab on every call. Interfaces without a slot can't
+        be looked up by slot and are skipped."""
+        return {
+            (iface.node.id, iface.slot): iface
+            for iface in self.lab.interfaces()
+            if iface.slot is not None
+        }
 
     def create_nx_network(self):
         """create a new random network using NetworkX"""
+        import numpy as np  # pylint: disable=import-outside-toplevel
 
         # cluster size
         size = int(self.args.nodes / 8)
@@ -207,16 +296,39 @@ class Renderer:
         # for testing/troubleshooting, this is quite useful
         # graph = nx.barbell_graph(5, 0)
 
-        if not nx.is_connected(graph):
-            complement = list(nx.k_edge_augmentation(graph, k=1))
-            graph.add_edges_from(complement)
-        pos = nx.kamada_kawai_layout(graph, scale=dimensions)
-        for key, value in pos.items():
-            graph.nodes[key]["pos"] = Point(int(value[0]), int(value[1]))
+        # chain the connected components, each by its first node. A single
+        # union-find pass, k_edge_augmentation() is overkill for k=1
+        components = UnionFind(graph.nodes)
+        for src, dst in graph.edges:
+            components.union(src, dst)
+        firsts: dict[int, int] = {}
+        for node in graph.nodes:
+            firsts.setdefault(components[node], node)
+        chain = list(firsts.values())
+        graph.add_edges_from(itertools.pairwise(chain))
+        if graph.number_of_nodes() > SPRING_LAYOUT_MAX_NODES:
+            pos = nx.random_layout(graph, seed=42)
+            pos = nx.rescale_layout_dict(pos, scale=dimensions)
+        elif graph.number_of_nodes() > KK_LAYOUT_MAX_NODES:
+            pos = nx.spring_layout(graph, scale=dimensions, iterations=50, seed=42)
+        else:
+            # a spectral layout is a better start for the optimization than
+            # the default circular layout and is cheap for small networks.
+            # It can place nodes on top of each other (e.g. both nodes of a
+            # two node network), these can't be moved apart by Kamada-Kawai
+            start = nx.spectral_layout(graph)
+            if len(np.unique(list(start.values()), axis=0)) < len(start):
+                start = None
+            pos = nx.kamada_kawai_layout(graph, pos=start, scale=dimensions)
+        # the layouts need NumPy anyway, truncate all coordinates in one go
+        coords = np.array(list(pos.values())).astype(int).tolist()
+        for key, (x, y) in zip(pos, coords):
+            graph.nodes[key]["pos"] = Point(x, y)
         return graph
 
-    def create_node(self, label: str, node_def: str, coords=Point(0, 0)):
-        """create a CML2 node with the given attributes"""
+    def create_node(self, label: str, node_def: str, coords=Point(0, 0), **kwargs):
+        """create a CML2 node with the given attributes, additional node
+        properties like the configuration are passed on to the API"""
 
         try:
             node = self.lab.create_node(
@@ -225,14 +337,24 @@ class Renderer:
                 x=coords.x,
                 y=coords.y,
                 populate_interfaces=True,
+                **kwargs,
             )
-            # this is needed, otherwise the default interfaces which are created
-            # might be missing locally
-            self.lab.sync(topology_only=True)
+            # the default interfaces which are created are missing locally
+            # until the lab is synced, callers sync once after creating nodes
             return node
         except HTTPError as exc:
             raise TopogenError("API error") from exc
 
+    def create_links(self, links: list[tuple[Interface, Interface]], progress=None):
+        """create the given links concurrently, links are independent of each
+        other. The optional progress counter is updated per created link."""
+        with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+            futures = [executor.submit(self.lab.create_link, *pair) for pair in links]
+            for future in as_completed(futures):
+                future.result()
+                if progress is not None:
+                    progress.update()
+
     def create_ext_conn(self, coords=Point(0, 0)):
         """create an external connector node"""
         return self.create_node(EXT_CON_NAME, "external_connector", coords)
@@ -247,81 +369,143 @@ class Renderer:
         """create a router node (this uses the template given, e.g. iosv)"""
         return self.create_node(label, self.args.template, coords)
 
-    def next_network(self) -> Set[IPv4Interface]:
-        """return the next point-to-point network"""
-        p2pnet = next(self.p2pnets)
-        return set(IPv4Interface(f"{i}/{p2pnet.netmask}") for i in p2pnet.hosts())
+    def next_network(self) -> Tuple[IPv4Iface, IPv4Iface]:
+        """return the two host addresses of the next point-to-point network"""
+        net = next(self.p2pnets)
+        # the set is deliberate: it reproduces the order of the former set of
+        # IPv4Interface objects, which decides which end of a link gets .1
+        # and which .2. Sorting would change the generated configurations.
+        # IPv4Interface hashes (address, prefix length, network address), a
+        # set of the same tuples iterates in the same order. Integer tuples
+        # hash the same in every run, independent of PYTHONHASHSEED.
+        first, second = {
+            (net + 1, P2P_PREFIXLEN, net),
+            (net + 2, P2P_PREFIXLEN, net),
+        }
+        return IPv4Iface(first[0], P2P_PREFIXLEN), IPv4Iface(second[0], P2P_PREFIXLEN)
+
+    def configure_router(
+        self,
+        cmlnode: Node,
+        node: TopogenNode,
+        origin: Any,
+        nameserver: str,
+        date: str,
+    ) -> str:
+        """render the configuration of the given router and apply it to its
+        CML node, returns the hostname"""
+        config = self.render_template(node=node, date=date, origin=origin)
+        # this is a special one-off for the LXC / frr variannt
+        if self.args.template == "lxc":
+            cmlnode.configuration = [
+                {
+                    "name": "boot.sh",
+                    "content": lxcfrr_bootconfig(
+                        self.config,
+                        node,
+                        ["ospf", "bgp"],
+                        nameserver,
+                        False,
+                    ),
+                },
+                {
+                    "name": "node.cfg",
+                    "content": config,
+                },
+            ]
+        else:
+            cmlnode.configuration = config
+        return node.hostname
 
     def render_node_network(self) -> int:
         """render the NX random network"""
 
         disable_pcl_loggers()
+        # the per element log arguments are PCL properties, only evaluate
+        # them when they are logged
+        verbose = _LOGGER.isEnabledFor(logging.INFO)
         _LOGGER.warning("Creating network")
         graph = self.create_nx_network()
 
-        if self.args.progress:
-            manager = enlighten.get_manager()
-            eprog = manager.counter(
-                total=graph.number_of_edges() + graph.number_of_nodes(),
-                desc="topology",
-                unit="elements",
-                leave=False,
-                color="cyan",
-            )
-
-        _LOGGER.warning("Creating edges and nodes")
-        for edge in graph.edges:
-            src, dst = edge
-            prefix = next(self.p2pnets)
-            graph.edges[edge]["prefix"] = prefix
-            graph.edges[edge]["hosts"] = iter(prefix.hosts())
-            for node_index in [src, dst]:
-                node = graph.nodes[node_index]
-                if node.get("cml2node") is None:
-                    cml2node = self.create_router(f"R{node_index+1}", node["pos"])
-                    _LOGGER.info("router: %s", cml2node.label)
-                    node["cml2node"] = cml2node
-                    if self.args.progress:
-                        eprog.update()  # type:ignore
-            src_iface = self.new_interface(graph.nodes[src]["cml2node"])
-            dst_iface = self.new_interface(graph.nodes[dst]["cml2node"])
-            self.lab.create_link(src_iface, dst_iface)
-
-            desc = (
-                f"{src_iface.node.label} {src_iface.label} -> "
-                + f"{dst_iface.node.label} {dst_iface.label}"
-            )
-            _LOGGER.info("link: %s", desc)
-            graph.edges[edge]["order"] = {
-                src: src_iface,
-                dst: dst_iface,
-            }
-
-            if self.args.progress:
-                eprog.update()  # type: ignore
+        # the manager is disabled without progress or when stdout is not a
+        # terminal, updating its counters is then close to a no-op
+        manager = enlighten.get_manager(enabled=self.args.progress)
+        eprog = manager.counter(
+            total=graph.number_of_edges() + graph.number_of_nodes(),
+            desc="topology",
+            unit="elements",
+            leave=False,
+            color="cyan",
+        )
 
-        if self.args.progress:
-            nprog = manager.counter(  # type: ignore
-                total=graph.number_of_nodes(),
-                replace=eprog,  # type: ignore
-                desc="configs ",
-                unit=" configs",
-                leave=False,
-                color="cyan",
-            )
+        _LOGGER.warning("Creating nodes")
+        # the CML nodes and their labels by graph node, looked up for every
+        # edge. The PCL label property checks whether to sync on every read.
+        cml2nodes: dict[int, Node] = {}
+        labels: dict[int, str] = {}
+        for node_index, pos in graph.nodes(data="pos"):
+            label = f"R{node_index+1}"
+            cml2node = self.create_router(label, pos)
+            if verbose:
+                _LOGGER.info("router: %s", label)
+            cml2nodes[node_index] = cml2node
+            labels[node_index] = label
+            eprog.update()
 
         # create the external connector
         ext_con = self.create_ext_conn(coords=Point(0, 0))
         _LOGGER.warning("External connector: %s", ext_con.label)
 
         # create the DNS host
-        dns_addr, dns_via = self.next_network()
         dns_host = self.create_dns_host(coords=Point(self.args.distance, 0))
         _LOGGER.warning("DNS host: %s", dns_host.label)
         dns_iface = dns_host.get_interface_by_slot(1)
 
+        # a single sync for all nodes makes their default interfaces known
+        self.lab.sync(topology_only=True)
+        self.collect_free_interfaces()
+
+        _LOGGER.warning("Creating edges")
+        links: list[tuple[Interface, Interface]] = []
+        for src, dst, eattr in graph.edges(data=True):
+            net = next(self.p2pnets)
+            src_iface = self.new_interface(cml2nodes[src])
+            dst_iface = self.new_interface(cml2nodes[dst])
+            links.append((src_iface, dst_iface))
+
+            src_name = f"{labels[src]} {src_iface.label}"
+            dst_name = f"{labels[dst]} {dst_iface.label}"
+            if verbose:
+                _LOGGER.info("link: %s -> %s", src_name, dst_name)
+            # both ends take their address from the same hosts iterator, all
+            # per edge data lives in a single attribute. Each end is a (slot,
+            # name, DNS name) tuple, the names of both ends are part of the
+            # descriptions and DNS entries of the edge and are formatted once.
+            eattr["link"] = (
+                iter(range(net + 1, net + 3)),
+                (
+                    src,
+                    (src_iface.slot, src_name, format_dns_name(src_name)),
+                    dst,
+                    (dst_iface.slot, dst_name, format_dns_name(dst_name)),
+                ),
+            )
+
+        self.create_links(links, eprog)
+
+        nprog = manager.counter(
+            total=graph.number_of_nodes(),
+            replace=eprog,
+            desc="configs ",
+            unit=" configs",
+            leave=False,
+            color="cyan",
+        )
+
+        dns_addr, dns_via = self.next_network()
+
         # prepare DNS configuration
-        self.config.nameserver = str(dns_addr.ip)
+        self.config.nameserver = dns_addr.ip
         dns_zone: list[DNShost] = []
 
         # link the two
@@ -331,65 +515,70 @@ class Renderer:
         )
         _LOGGER.warning("Creating ext-conn link")
 
-        core = sorted(
-            nx.degree_centrality(graph).items(), key=lambda e: e[1], reverse=True
-        )[0][0]
+        # the node with the highest degree, the first one in case of a tie.
+        # Degree centrality is the degree divided by N-1, same order.
+        core = max(graph.degree, key=itemgetter(1))[0]
         _LOGGER.warning("Identified core node is R%s", core + 1)
 
         _LOGGER.warning("Creating node configurations")
+        configs: list[tuple[Node, TopogenNode, Any]] = []
+        is_iol = self.args.template == "iol"
         for node_index, nbrs in graph.adj.items():
+            # kept sorted by slot, interfaces are mostly handed out in slot
+            # order so that insertion is usually an append
             interfaces: list[TopogenInterface] = []
 
-            for _, eattr in nbrs.items():
-                prefix = eattr["prefix"]
-                hosts = eattr["hosts"]
-                order = eattr["order"]
-
-                addr = IPv4Interface(f"{next(hosts)}/{prefix.netmask}")
-                label = format_interface_description(order, node_index)
-                interfaces.append(
-                    TopogenInterface(addr, label, slot=order[node_index].slot)
+            for eattr in nbrs.values():
+                hosts, ends = eattr["link"]
+                this_end, other_end = order_iface_pair(ends, node_index)
+                slot, _, this_dns = this_end
+                _, other_name, other_dns = other_end
+
+                addr = IPv4Iface(next(hosts), P2P_PREFIXLEN)
+                insort(
+                    interfaces,
+                    TopogenInterface(addr, f"to {other_name}", slot=slot),
+                    key=BY_SLOT,
                 )
-                dns_zone.append(DNShost(format_dns_entry(order, node_index), addr.ip))
+                dns_zone.append(DNShost(f"{this_dns}--{other_dns}", addr.ip))
 
             if node_index == core:
-                core_iface = self.new_interface(graph.nodes[node_index]["cml2node"])
+                core_iface = self.new_interface(cml2nodes[node_index])
                 self.lab.create_link(
                     dns_iface,
                     core_iface,
                 )
 
                 # Use a stupidly high node number for the DNS host, otherwise,
-                # in case the DNS host is selected as the central node, the
-                # pair would only have one element (prior to this, 0 was used
-                # as the key).
-                pair = {core: core_iface, 999999: dns_iface}
+                # in case R1 is selected as the central node, both ends of
+                # the pair would have the same index (prior to this, 0 was
+                # used as the index).
+                pair = (core, core_iface, 999999, dns_iface)
                 label = format_interface_description(pair, node_index)
                 assert core_iface.slot is not None
-                interfaces.append(
-                    TopogenInterface(dns_via, label, slot=core_iface.slot)
+                insort(
+                    interfaces,
+                    TopogenInterface(dns_via, label, slot=core_iface.slot),
+                    key=BY_SLOT,
                 )
                 dns_zone.append(DNShost(format_dns_entry(pair, node_index), dns_via.ip))
 
                 _LOGGER.warning("DNS host link")
 
-            # need to sort interface list by slot
-            interfaces.sort(key=lambda x: x.slot)
-
             # hack for IOL
-            if self.args.template == "iol":
+            if is_iol:
                 leftover = 4 - len(interfaces) % 4
                 if leftover in range(1, 4):  # 1, 2 or 3
                     for _ in range(leftover):
                         interfaces.append(
                             TopogenInterface(
-                                IPv4Interface("0.0.0.0/0"),
+                                IPv4Iface(0, 0),
                                 description="unused",
                                 slot=0,
                             )
                         )
 
-            loopback = IPv4Interface(next(self.loopbacks))
+            loopback = IPv4Iface(next(self.loopbacks), 32)
             node = TopogenNode(
                 hostname=f"R{node_index+1}",
                 loopback=loopback,
@@ -397,42 +586,24 @@ class Renderer:
             )
             # "origin" identifies the default gateway on the node connecting
             # to the DNS host
-            config = self.template.render(
-                config=self.config,
-                node=node,
-                date=datetime.now(timezone.utc),
-                origin="" if node_index != core else dns_addr,
-            )
-            cmlnode: Node = graph.nodes[node_index]["cml2node"]
-            # this is a special one-off for the LXC / frr variannt
-            if self.args.template == "lxc":
-                nameserver = (
-                    self.config.nameserver if self.config.nameserver else dns_addr.ip
-                )
-                cmlnode.configuration = [
-                    {
-                        "name": "boot.sh",
-                        "content": lxcfrr_bootconfig(
-                            self.config,
-                            node,
-                            ["ospf", "bgp"],
-                            str(nameserver),
-                            False,
-                        ),
-                    },
-                    {
-                        "name": "node.cfg",
-                        "content": config,
-                    },
-                ]
-            else:
-                cmlnode.configuration = config
-            # graph.nodes[node_index]["cml2node"].config = config
-
+            origin = "" if node_index != core else dns_addr
+            configs.append((cml2nodes[node_index], node, origin))
             dns_zone.append(DNShost(node.hostname.lower(), loopback.ip))
-            _LOGGER.warning("Config created for %s", node.hostname)
-            if self.args.progress:
-                nprog.update()  # type: ignore
+
+        # the addresses are assigned, rendering and applying the
+        # configurations is independent per node, do it concurrently. Values
+        # which are the same for all routers are only computed once.
+        nameserver = self.config.nameserver if self.config.nameserver else dns_addr.ip
+        date = str(datetime.now(timezone.utc))
+        with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+            futures = [
+                executor.submit(self.configure_router, *job, nameserver, date)
+                for job in configs
+            ]
+            for future in as_completed(futures):
+                hostname = future.result()
+                _LOGGER.warning("Config created for %s", hostname)
+                nprog.update()
 
         # finalize the DNS host configuration
         node = TopogenNode(
@@ -448,9 +619,8 @@ class Renderer:
         _LOGGER.warning("Config created for DNS host")
         _LOGGER.warning("Done")
 
-        if self.args.progress:
-            nprog.close()  # type: ignore
-            manager.stop()  # type: ignore
+        nprog.close()
+        manager.stop()
 
         return 0
 
@@ -462,43 +632,43 @@ class Renderer:
         """
 
         disable_pcl_loggers()
+        # the per element log arguments are PCL properties, only evaluate
+        # them when they are logged
+        verbose = _LOGGER.isEnabledFor(logging.INFO)
         prev_iface = None
-        prev_cml2iface = None
 
+        # the manager is disabled without progress or when stdout is not a
+        # terminal, updating its counter is then close to a no-op
+        manager = enlighten.get_manager(enabled=self.args.progress)
         if self.args.progress:
-            manager = enlighten.get_manager(coords=next(self.coords))
-            ticks = manager.counter(
-                total=self.args.nodes,
-                desc="Progress",
-                unit="nodes",
-                color="cyan",
-                leave=False,
-            )
+            # the progress manager used to take the first spiral point, keep
+            # the node placement as it was
+            next(self.coords)
+        ticks = manager.counter(
+            total=self.args.nodes,
+            desc="Progress",
+            unit="nodes",
+            color="cyan",
+            leave=False,
+        )
 
         # create the external connector
-        cml2_node = self.create_ext_conn()
-        _LOGGER.info("external connector: %s", cml2_node.label)
+        ext_con = self.create_ext_conn()
+        _LOGGER.info("external connector: %s", ext_con.label)
 
         # create the DNS host
         dns_iface, prev_iface = self.next_network()
         dns_via = prev_iface
         dns_host = self.create_dns_host(coords=next(self.coords))
         _LOGGER.info("DNS host: %s", dns_host.label)
-        prev_cml2iface = dns_host.get_interface_by_slot(1)
 
         # prepare DNS configuration
-        self.config.nameserver = str(dns_iface.ip)
+        self.config.nameserver = dns_iface.ip
         dns_zone: list[DNShost] = []
 
-        # link the two
-        self.lab.create_link(
-            cml2_node.get_interface_by_slot(0),
-            dns_host.get_interface_by_slot(0),
-        )
-        _LOGGER.info("ext-conn link")
-
+        cml2_nodes: list[Node] = []
         for idx in range(self.args.nodes):
-            loopback = IPv4Interface(next(self.loopbacks))
+            loopback = IPv4Iface(next(self.loopbacks), 32)
             src_iface, dst_iface = self.next_network()
             interfaces = [
                 TopogenInterface(src_iface),
@@ -509,19 +679,40 @@ class Renderer:
                 loopback=loopback,
                 interfaces=interfaces,
             )
-            config = self.template.render(config=self.config, node=node)
+            # the configuration is sent with the node, not in a second request
             cml2_node = self.create_node(
-                node.hostname, self.args.template, next(self.coords)
+                node.hostname,
+                self.args.template,
+                next(self.coords),
+                configuration=self.render_template(node=node),
             )
-            cml2_node.config = config
-            _LOGGER.info("node: %s", cml2_node.label)
-            self.lab.create_link(prev_cml2iface, cml2_node.get_interface_by_slot(1))
-            _LOGGER.info("link %s", prev_cml2iface.label)
-            prev_cml2iface = cml2_node.get_interface_by_slot(0)
+            if verbose:
+                _LOGGER.info("node: %s", cml2_node.label)
+            cml2_nodes.append(cml2_node)
             dns_zone.append(DNShost(node.hostname.lower(), loopback.ip))
             prev_iface = dst_iface
-            if self.args.progress:
-                ticks.update()  # type: ignore
+            ticks.update()
+
+        # a single sync for all nodes makes their default interfaces known
+        self.lab.sync(topology_only=True)
+        slots = self.interfaces_by_slot()
+
+        # link the external connector and the DNS host
+        self.lab.create_link(
+            slots[ext_con.id, 0],
+            slots[dns_host.id, 0],
+        )
+        _LOGGER.info("ext-conn link")
+
+        # chain the routers, starting at the DNS host
+        links: list[tuple[Interface, Interface]] = []
+        prev_cml2iface = slots[dns_host.id, 1]
+        for cml2_node in cml2_nodes:
+            links.append((prev_cml2iface, slots[cml2_node.id, 1]))
+            if verbose:
+                _LOGGER.info("link %s", prev_cml2iface.label)
+            prev_cml2iface = slots[cml2_node.id, 0]
+        self.create_links(links)
 
         # finalize the DNS host configuration
         node = TopogenNode(
@@ -534,8 +725,7 @@ class Renderer:
         )
         dns_host.config = dnshostconfig(self.config, node, dns_zone)
 
-        if self.args.progress:
-            ticks.close()  # type: ignore
-            manager.stop()  # type: ignore
+        ticks.close()
+        manager.stop()
 
         return 0
@@ -0,0 +1,47 @@
+"""Jinja templates of the package and helpers shared by their users"""
+
+import functools
+import threading
+
+from jinja2 import (
+    BytecodeCache,
+    DictLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    Template,
+)
+
+# templates built from strings by name, see string_template()
+_STRING_TEMPLATES: dict[str, Template] = {}
+_STRING_TEMPLATES_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def bytecode_cache() -> BytecodeCache | None:
+    """return the bytecode cache for compiled templates. The cache directory
+    is created on first use, if it can't be (e.g. no usable temp directory)
+    templates are simply compiled on every run."""
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
+
+
+def string_template(name: str, source: str) -> Template:
+    """return the template with the given name compiled from source. It is
+    built on first use, the renderer configures nodes from several threads
+    and the lock makes sure this happens only once."""
+    template = _STRING_TEMPLATES.get(name)
+    if template is None:
+        with _STRING_TEMPLATES_LOCK:
+            template = _STRING_TEMPLATES.get(name)
+            if template is None:
+                # templates rendered from strings bypass the bytecode cache,
+                # hence the loader
+                env = Environment(
+                    loader=DictLoader({name: source}),
+                    bytecode_cache=bytecode_cache(),
+                )
+                template = env.get_template(name)
+                _STRING_TEMPLATES[name] = template
+    return template
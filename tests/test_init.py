@@ -0,0 +1,47 @@
+"""tests for the package exports"""
+
+import subprocess
+import sys
+import unittest
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    # a fresh interpreter, the import order matters and modules are cached
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False
+    )
+
+
+class TestMainExport(unittest.TestCase):
+    """topogen.main is the console script entry point, not the submodule"""
+
+    def test_main_after_submodule_import(self):
+        result = run_python(
+            "import topogen.main\n"
+            "from topogen import main\n"
+            "assert callable(main), main\n"
+            "assert main.__module__ == 'topogen.main', main\n"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_main_after_from_submodule_import(self):
+        result = run_python(
+            "from topogen.main import create_argparser\n"
+            "from topogen import main\n"
+            "assert callable(main), main\n"
+            "assert main.__module__ == 'topogen.main', main\n"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_import_skips_renderer(self):
+        result = run_python(
+            "import sys\n"
+            "from topogen import main\n"
+            "assert 'topogen.render' not in sys.modules\n"
+            "assert 'networkx' not in sys.modules\n"
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""tests for the topology rendering"""
+
+import importlib.util
+import unittest
+import warnings
+from argparse import Namespace
+
+from topogen.render import Renderer
+
+HAS_LAYOUT_DEPS = all(importlib.util.find_spec(m) for m in ("numpy", "scipy"))
+
+
+@unittest.skipUnless(HAS_LAYOUT_DEPS, "the layouts need NumPy and SciPy")
+class TestCreateNxNetwork(unittest.TestCase):
+    """the NetworkX layout, no CML controller is needed for this"""
+
+    def create_nx_network(self, nodes: int):
+        # only the arguments are used, skip connecting to a controller
+        renderer = Renderer.__new__(Renderer)
+        renderer.args = Namespace(nodes=nodes, distance=200)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            return renderer.create_nx_network()
+
+    def test_two_nodes_distinct_coords(self):
+        graph = self.create_nx_network(2)
+        coords = {(pos.x, pos.y) for _, pos in graph.nodes.data("pos")}
+        self.assertEqual(len(coords), 2)
+
+    def test_small_network_distinct_coords(self):
+        for nodes in (3, 5, 10, 50):
+            with self.subTest(nodes=nodes):
+                graph = self.create_nx_network(nodes)
+                coords = {(pos.x, pos.y) for _, pos in graph.nodes.data("pos")}
+                self.assertEqual(len(coords), nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()